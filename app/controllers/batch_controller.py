@@ -1,4 +1,4 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, status
+from fastapi import APIRouter, Query, Request, Response, UploadFile, File, HTTPException, status
 from app.models.schemas import (
     BatchUploadResponse, BatchStatusResponse, 
     BatchProgressResponse, HTTPValidationError,
@@ -25,7 +25,7 @@ async def upload_csv(
     file: UploadFile = File(..., description="CSV file with columns: name,address,phone")
 ):
     # Validate file
-    if not file.filename.endswith('.csv'):
+    if not file.filename.lower().endswith('.csv'):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail={
@@ -36,7 +36,19 @@ async def upload_csv(
                 }]
             }
         )
-    
+
+    if not await CSVValidator.looks_like_csv(file):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "detail": [{
+                    "loc": ["file", "content"],
+                    "msg": "File content does not look like CSV",
+                    "type": "file_content_error"
+                }]
+            }
+        )
+
     try:
         return await batch_service.initiate_csv_upload(file)
     except CSVValidationException as e:
@@ -53,11 +65,15 @@ async def upload_csv(
         404: {"description": "Batch not found"}
     },
     summary="Get batch status",
-    description="Get current status of a batch with fresh data from external API"
+    description="Get current status of a batch with fresh data from external API. The hospitals list is paginated via limit/offset; counters always cover the whole batch."
 )
-async def get_batch_status(batch_id: str):
+async def get_batch_status(
+    batch_id: str,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum hospitals to return"),
+    offset: int = Query(0, ge=0, description="Number of hospitals to skip")
+):
     try:
-        return await batch_service.get_batch_status(batch_id)
+        return await batch_service.get_batch_status(batch_id, limit=limit, offset=offset)
     except BatchNotFoundException as e:
         raise e
 
@@ -69,14 +85,26 @@ async def get_batch_status(batch_id: str):
         404: {"description": "Batch not found"}
     },
     summary="Get batch processing progress (Polling endpoint)",
-    description="Get real-time progress of batch processing."
+    description="Get real-time progress of batch processing. Supports ETag/If-None-Match so unchanged polls return 304."
 )
-async def get_batch_progress(batch_id: str):
+async def get_batch_progress(batch_id: str, request: Request, response: Response):
     try:
-        return await batch_service.get_batch_progress(batch_id)
+        progress = await batch_service.get_batch_progress(batch_id)
     except BatchNotFoundException as e:
         raise e
 
+    # Pollers hit this every 1-2s; most polls see no change. Answer those
+    # with an empty 304 instead of re-serializing the same body.
+    etag = (
+        f'"{batch_id}-{progress.processed_hospitals}'
+        f'-{progress.failed_hospitals}-{progress.processing_status.value}"'
+    )
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return progress
+
 @router.post(
     "/validate-csv",
     response_model=CSVValidationSuccessResponse,
@@ -90,7 +118,7 @@ async def get_batch_progress(batch_id: str):
 async def validate_csv(
     file: UploadFile = File(..., description="CSV file with columns: name,address,phone")
 ):
-    if not file.filename.endswith('.csv'):
+    if not file.filename.lower().endswith('.csv'):
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail={
@@ -103,7 +131,21 @@ async def validate_csv(
                 }]
             }
         )
-    
+
+    if not await CSVValidator.looks_like_csv(file):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "valid": False,
+                "message": "Invalid file content",
+                "errors": [{
+                    "loc": ["file", "content"],
+                    "msg": "File content does not look like CSV",
+                    "type": "file_content_error"
+                }]
+            }
+        )
+
     try:
         csv_validator = CSVValidator()
         parsed_rows, _ = await csv_validator.validate_and_parse(file)
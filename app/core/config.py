@@ -14,6 +14,11 @@ class Settings:
     APP_DESCRIPTION: str = "Bulk hospital creation and management system"
     APP_HOST: str = os.getenv("APP_HOST", "0.0.0.0")
     APP_PORT: int = int(os.getenv("APP_PORT", 8000))
+
+    # Celery / Redis Configuration
+    # When set, batch processing is offloaded to Celery workers instead of
+    # running in-process on the API event loop.
+    REDIS_URL: str = os.getenv("REDIS_URL", "")
     
     # CSV Configuration
     CSV_REQUIRED_HEADERS: list = ["name", "address", "phone"]
@@ -21,5 +26,9 @@ class Settings:
     
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # Server Configuration
+    APP_RELOAD: bool = os.getenv("APP_RELOAD", "false").lower() == "true"
+    UVICORN_WORKERS: int = int(os.getenv("UVICORN_WORKERS", os.cpu_count() or 1))
+
 
 settings = Settings()
@@ -1,7 +1,16 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.controllers import batch_controller, health_controller
+from app.services.hospital_service import hospital_service
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Drain the pooled external-API client on shutdown
+    await hospital_service.aclose()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -10,7 +19,8 @@ app = FastAPI(
     description=settings.APP_DESCRIPTION,
     docs_url="/docs",
     redoc_url="/redoc",
-    openapi_url="/openapi.json"
+    openapi_url="/openapi.json",
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -39,10 +49,27 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host=settings.APP_HOST,
-        port=settings.APP_PORT,
-        reload=True,
-        log_level=settings.LOG_LEVEL.lower()
-    )
+    if settings.APP_RELOAD:
+        # Development: auto-reload, single worker
+        uvicorn.run(
+            "app.main:app",
+            host=settings.APP_HOST,
+            port=settings.APP_PORT,
+            reload=True,
+            log_level=settings.LOG_LEVEL.lower()
+        )
+    else:
+        # Production: uvloop + httptools and one worker per CPU. Multiple
+        # workers only share batch state through Redis; without REDIS_URL the
+        # in-memory repository is per-process and polls would 404 on every
+        # worker except the one that took the upload, so stay single-worker.
+        workers = settings.UVICORN_WORKERS if settings.REDIS_URL else 1
+        uvicorn.run(
+            "app.main:app",
+            host=settings.APP_HOST,
+            port=settings.APP_PORT,
+            loop="uvloop",
+            http="httptools",
+            workers=workers,
+            log_level=settings.LOG_LEVEL.lower()
+        )
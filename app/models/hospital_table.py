@@ -0,0 +1,121 @@
+from array import array
+from typing import List, Optional
+import numpy as np
+from app.models.enums import HospitalStatus
+
+# Statuses are stored as uint8 codes (1 byte per record instead of a shared
+# str-enum reference) and decoded back to HospitalStatus at the edges.
+_STATUS_CODE = {
+    HospitalStatus.CREATED_AND_ACTIVATED: 1,
+    HospitalStatus.CREATED: 2,
+    HospitalStatus.FAILED: 3,
+    HospitalStatus.DELETED: 4,
+}
+_CODE_STATUS = {code: status for status, code in _STATUS_CODE.items()}
+
+
+class HospitalTable:
+    """Column-oriented storage for the hospital records of one batch.
+
+    Keeping one array per field instead of one object per record makes
+    status updates an index assignment and bulk counts a single column
+    scan, instead of walking N Pydantic objects.
+    """
+
+    __slots__ = (
+        "rows", "hospital_ids", "names", "addresses",
+        "phones", "status_codes", "error_messages"
+    )
+
+    def __init__(self):
+        self.rows: List[int] = []
+        self.hospital_ids: List[Optional[int]] = []
+        self.names: List[str] = []
+        self.addresses: List[str] = []
+        self.phones: List[Optional[str]] = []
+        self.status_codes: array = array("B")
+        self.error_messages: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _status_view(self) -> np.ndarray:
+        """Writable uint8 view over the status column"""
+        return np.frombuffer(self.status_codes, dtype=np.uint8)
+
+    @classmethod
+    def from_records(cls, records) -> "HospitalTable":
+        """Build a table from HospitalRecord-like objects"""
+        table = cls()
+        table.extend(records)
+        return table
+
+    def extend(self, records) -> None:
+        """Append HospitalRecord-like objects column by column"""
+        for record in records:
+            self.rows.append(record.row)
+            self.hospital_ids.append(record.hospital_id)
+            self.names.append(record.name)
+            self.addresses.append(record.address)
+            self.phones.append(record.phone)
+            self.status_codes.append(_STATUS_CODE[record.status])
+            self.error_messages.append(record.error_message)
+
+    def status_at(self, index: int) -> HospitalStatus:
+        return _CODE_STATUS[self.status_codes[index]]
+
+    def update_status(self, index: int, status: HospitalStatus) -> None:
+        self.status_codes[index] = _STATUS_CODE[status]
+
+    def set_status_by_id(self, hospital_id: int, status: HospitalStatus) -> bool:
+        """Update the status of the record with the given external id"""
+        for index, existing_id in enumerate(self.hospital_ids):
+            if existing_id == hospital_id:
+                self.status_codes[index] = _STATUS_CODE[status]
+                return True
+        return False
+
+    def count_by_status(self, status: HospitalStatus) -> int:
+        if not self.status_codes:
+            return 0
+        return int(np.count_nonzero(self._status_view() == _STATUS_CODE[status]))
+
+    def status_counts(self) -> dict:
+        """Count every status in one pass over the column"""
+        if not self.status_codes:
+            return {status: 0 for status in _STATUS_CODE}
+        counts = np.bincount(self._status_view(), minlength=len(_STATUS_CODE) + 1)
+        return {status: int(counts[code]) for status, code in _STATUS_CODE.items()}
+
+    def replace_status(self, old: HospitalStatus, new: HospitalStatus) -> None:
+        """Rewrite every occurrence of one status with another"""
+        if not self.status_codes:
+            return
+        view = self._status_view()
+        view[view == _STATUS_CODE[old]] = _STATUS_CODE[new]
+
+    def record_at(self, index: int):
+        # Imported here: schemas imports this module for the BatchData field
+        from app.models.schemas import HospitalRecord
+        return HospitalRecord.model_construct(
+            row=self.rows[index],
+            hospital_id=self.hospital_ids[index],
+            name=self.names[index],
+            address=self.addresses[index],
+            phone=self.phones[index],
+            status=_CODE_STATUS[self.status_codes[index]],
+            error_message=self.error_messages[index]
+        )
+
+    def to_records(self, offset: int = 0, limit: Optional[int] = None) -> List:
+        """Materialize a window of rows as HospitalRecord objects"""
+        end = len(self.rows) if limit is None else min(offset + limit, len(self.rows))
+        return [self.record_at(index) for index in range(offset, end)]
+
+    def records_with_status(self, status: HospitalStatus) -> List:
+        code = _STATUS_CODE[status]
+        return [
+            self.record_at(index)
+            for index, current in enumerate(self.status_codes)
+            if current == code
+        ]
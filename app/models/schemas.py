@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 from app.models.enums import HospitalStatus, BatchProcessingStatus
+from app.models.hospital_table import HospitalTable
 
 # External API Schemas
 class HospitalCreate(BaseModel):
@@ -49,6 +50,8 @@ class HospitalRecord(BaseModel):
 
 
 class BatchData(BaseModel):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     batch_id: str
     total_hospitals: int
     processed_hospitals: int = 0
@@ -56,7 +59,9 @@ class BatchData(BaseModel):
     processing_time_seconds: float = 0.0
     batch_activated: bool = False
     processing_status: BatchProcessingStatus = BatchProcessingStatus.PENDING
-    hospitals: List[HospitalRecord] = []
+    # Column-oriented (structure-of-arrays) record storage; materialized into
+    # HospitalRecord objects only at the response boundary
+    hospitals: HospitalTable = Field(default_factory=HospitalTable)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
@@ -1,57 +1,89 @@
+import asyncio
 from typing import Dict, Optional, List
+from app.core.config import settings
 from app.models.schemas import BatchData, HospitalRecord
 from app.models.enums import HospitalStatus
 
 
 class BatchRepository:
+    """In-memory batch storage for single-process deployments.
+
+    The interface is async so it stays interchangeable with the Redis backend.
+    """
+
     def __init__(self):
         self._storage: Dict[str, BatchData] = {}
-    
-    def save(self, batch_data: BatchData) -> BatchData:
+        self._counter_lock = asyncio.Lock()
+
+    async def save(self, batch_data: BatchData) -> BatchData:
         """Save or update batch data"""
         self._storage[batch_data.batch_id] = batch_data
         return batch_data
-    
-    def get(self, batch_id: str) -> Optional[BatchData]:
+
+    async def get(self, batch_id: str) -> Optional[BatchData]:
         """Get batch data by ID"""
         return self._storage.get(batch_id)
-    
-    def exists(self, batch_id: str) -> bool:
+
+    async def exists(self, batch_id: str) -> bool:
         """Check if batch exists"""
         return batch_id in self._storage
-    
-    def update_hospital_status(
-        self, 
-        batch_id: str, 
-        hospital_id: int, 
+
+    async def increment_processed(self, batch_id: str, amount: int = 1) -> None:
+        """Atomically increment the processed-hospitals counter"""
+        async with self._counter_lock:
+            batch_data = self._storage.get(batch_id)
+            if batch_data:
+                batch_data.processed_hospitals += amount
+
+    async def increment_failed(self, batch_id: str, amount: int = 1) -> None:
+        """Atomically increment the failed-hospitals counter"""
+        async with self._counter_lock:
+            batch_data = self._storage.get(batch_id)
+            if batch_data:
+                batch_data.failed_hospitals += amount
+
+    async def update_hospital_status(
+        self,
+        batch_id: str,
+        hospital_id: int,
         status: HospitalStatus
     ) -> bool:
         """Update hospital status in batch"""
-        batch_data = self.get(batch_id)
+        batch_data = self._storage.get(batch_id)
         if not batch_data:
             return False
-        
-        for hospital in batch_data.hospitals:
-            if hospital.hospital_id == hospital_id:
-                hospital.status = status
-                self.save(batch_data)
-                return True
-        
-        return False
-    
-    def get_hospitals_by_status(
-        self, 
-        batch_id: str, 
+
+        return batch_data.hospitals.set_status_by_id(hospital_id, status)
+
+    async def bulk_update_statuses(
+        self,
+        batch_id: str,
+        changes: List[tuple]
+    ) -> None:
+        """Apply (index, status) changes without rewriting the batch.
+
+        Direct index assignment, O(changes); no per-change id scan.
+        """
+        batch_data = self._storage.get(batch_id)
+        if not batch_data or not changes:
+            return
+
+        for index, new_status in changes:
+            batch_data.hospitals.update_status(index, new_status)
+
+    async def get_hospitals_by_status(
+        self,
+        batch_id: str,
         status: HospitalStatus
     ) -> List[HospitalRecord]:
         """Get hospitals by status in a batch"""
-        batch_data = self.get(batch_id)
+        batch_data = self._storage.get(batch_id)
         if not batch_data:
             return []
-        
-        return [h for h in batch_data.hospitals if h.status == status]
-    
-    def delete(self, batch_id: str) -> bool:
+
+        return batch_data.hospitals.records_with_status(status)
+
+    async def delete(self, batch_id: str) -> bool:
         """Delete batch data"""
         if batch_id in self._storage:
             del self._storage[batch_id]
@@ -59,5 +91,10 @@ class BatchRepository:
         return False
 
 
-# Singleton instance
-batch_repository = BatchRepository()
+# Singleton instance: Redis-backed when a broker is configured so the API
+# and Celery workers share state, in-memory otherwise.
+if settings.REDIS_URL:
+    from app.repositories.redis_batch_repository import RedisBatchRepository
+    batch_repository = RedisBatchRepository(settings.REDIS_URL)
+else:
+    batch_repository = BatchRepository()
@@ -0,0 +1,152 @@
+import redis.asyncio as redis
+from typing import Optional, List
+from datetime import datetime
+from app.models.schemas import BatchData, HospitalRecord
+from app.models.hospital_table import HospitalTable
+from app.models.enums import HospitalStatus, BatchProcessingStatus
+
+
+class RedisBatchRepository:
+    """Redis-backed batch storage shared between the API and Celery workers.
+
+    Batch metadata lives in a hash at ``batch:{id}`` so counters can be
+    updated with atomic HINCRBY instead of re-serializing the whole batch.
+    Hospital records live in a list at ``batch:{id}:hospitals``.
+    """
+
+    def __init__(self, url: str):
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    @staticmethod
+    def _batch_key(batch_id: str) -> str:
+        return f"batch:{batch_id}"
+
+    @staticmethod
+    def _hospitals_key(batch_id: str) -> str:
+        return f"batch:{batch_id}:hospitals"
+
+    async def save(self, batch_data: BatchData) -> BatchData:
+        """Save or update batch data"""
+        mapping = {
+            "batch_id": batch_data.batch_id,
+            "total_hospitals": batch_data.total_hospitals,
+            "processed_hospitals": batch_data.processed_hospitals,
+            "failed_hospitals": batch_data.failed_hospitals,
+            "processing_time_seconds": batch_data.processing_time_seconds,
+            "batch_activated": int(batch_data.batch_activated),
+            "processing_status": batch_data.processing_status.value,
+            "created_at": batch_data.created_at.isoformat(),
+            "started_at": batch_data.started_at.isoformat() if batch_data.started_at else "",
+            "completed_at": batch_data.completed_at.isoformat() if batch_data.completed_at else "",
+        }
+        records = batch_data.hospitals.to_records()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._batch_key(batch_data.batch_id), mapping=mapping)
+            pipe.delete(self._hospitals_key(batch_data.batch_id))
+            if records:
+                pipe.rpush(
+                    self._hospitals_key(batch_data.batch_id),
+                    *[h.model_dump_json() for h in records]
+                )
+            await pipe.execute()
+        return batch_data
+
+    async def get(self, batch_id: str) -> Optional[BatchData]:
+        """Get batch data by ID"""
+        data = await self._redis.hgetall(self._batch_key(batch_id))
+        if not data:
+            return None
+
+        raw_hospitals = await self._redis.lrange(self._hospitals_key(batch_id), 0, -1)
+        return BatchData(
+            batch_id=data["batch_id"],
+            total_hospitals=int(data["total_hospitals"]),
+            processed_hospitals=int(data["processed_hospitals"]),
+            failed_hospitals=int(data["failed_hospitals"]),
+            processing_time_seconds=float(data["processing_time_seconds"]),
+            batch_activated=bool(int(data["batch_activated"])),
+            processing_status=BatchProcessingStatus(data["processing_status"]),
+            hospitals=HospitalTable.from_records(
+                HospitalRecord.model_validate_json(raw) for raw in raw_hospitals
+            ),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            started_at=datetime.fromisoformat(data["started_at"]) if data["started_at"] else None,
+            completed_at=datetime.fromisoformat(data["completed_at"]) if data["completed_at"] else None,
+        )
+
+    async def exists(self, batch_id: str) -> bool:
+        """Check if batch exists"""
+        return bool(await self._redis.exists(self._batch_key(batch_id)))
+
+    async def increment_processed(self, batch_id: str, amount: int = 1) -> None:
+        """Atomically increment the processed-hospitals counter"""
+        await self._redis.hincrby(self._batch_key(batch_id), "processed_hospitals", amount)
+
+    async def increment_failed(self, batch_id: str, amount: int = 1) -> None:
+        """Atomically increment the failed-hospitals counter"""
+        await self._redis.hincrby(self._batch_key(batch_id), "failed_hospitals", amount)
+
+    async def update_hospital_status(
+        self,
+        batch_id: str,
+        hospital_id: int,
+        status: HospitalStatus
+    ) -> bool:
+        """Update hospital status in batch"""
+        raw_hospitals = await self._redis.lrange(self._hospitals_key(batch_id), 0, -1)
+        for index, raw in enumerate(raw_hospitals):
+            hospital = HospitalRecord.model_validate_json(raw)
+            if hospital.hospital_id == hospital_id:
+                hospital.status = status
+                await self._redis.lset(
+                    self._hospitals_key(batch_id), index, hospital.model_dump_json()
+                )
+                return True
+        return False
+
+    async def bulk_update_statuses(
+        self,
+        batch_id: str,
+        changes: List[tuple]
+    ) -> None:
+        """Apply (index, status) changes without rewriting the batch.
+
+        Only the changed positions are read back (pipelined LINDEX) and
+        rewritten in place (pipelined LSET); untouched records never leave
+        Redis.
+        """
+        if not changes:
+            return
+
+        key = self._hospitals_key(batch_id)
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for index, _ in changes:
+                pipe.lindex(key, index)
+            raw_hospitals = await pipe.execute()
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for (index, new_status), raw in zip(changes, raw_hospitals):
+                if raw is None:
+                    continue
+                hospital = HospitalRecord.model_validate_json(raw)
+                if hospital.status != new_status:
+                    hospital.status = new_status
+                    pipe.lset(key, index, hospital.model_dump_json())
+            await pipe.execute()
+
+    async def get_hospitals_by_status(
+        self,
+        batch_id: str,
+        status: HospitalStatus
+    ) -> List[HospitalRecord]:
+        """Get hospitals by status in a batch"""
+        raw_hospitals = await self._redis.lrange(self._hospitals_key(batch_id), 0, -1)
+        hospitals = [HospitalRecord.model_validate_json(raw) for raw in raw_hospitals]
+        return [h for h in hospitals if h.status == status]
+
+    async def delete(self, batch_id: str) -> bool:
+        """Delete batch data"""
+        deleted = await self._redis.delete(
+            self._batch_key(batch_id), self._hospitals_key(batch_id)
+        )
+        return deleted > 0
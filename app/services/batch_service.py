@@ -4,21 +4,50 @@ import asyncio
 from typing import List, Dict
 from datetime import datetime
 from fastapi import UploadFile
+from app.core.config import settings
 from app.models.schemas import (
     BatchData, BatchUploadResponse, BatchStatusResponse,
-    BatchProgressResponse, HospitalRecord, HospitalCreate,
-    BatchCompleteResponse
+    BatchProgressResponse, HospitalRecord, HospitalCreate
 )
 from app.models.enums import HospitalStatus, BatchProcessingStatus
+from app.models.hospital_table import HospitalTable
 from app.repositories.batch_repository import batch_repository
 from app.services.hospital_service import hospital_service
 from app.utils.csv_validator import CSVValidator
 from app.utils.exceptions import BatchNotFoundException, CSVValidationException
 
 
+# Module-level frozensets: O(1) membership without a fresh list allocation on
+# every record visited.
+_FINISHED_BATCH_STATES = frozenset({
+    BatchProcessingStatus.COMPLETED,
+    BatchProcessingStatus.PARTIALLY_COMPLETED
+})
+_TERMINAL_RECORD_STATES = frozenset({
+    HospitalStatus.DELETED,
+    HospitalStatus.FAILED
+})
+
+# Progress-message builders keyed by status, looked up once per poll instead
+# of walking an if/elif chain of enum comparisons.
+_PROGRESS_MESSAGES = {
+    BatchProcessingStatus.PENDING:
+        lambda batch, processed, total: "Batch processing queued",
+    BatchProcessingStatus.PROCESSING:
+        lambda batch, processed, total: f"Processing hospital {processed}/{total}",
+    BatchProcessingStatus.COMPLETED:
+        lambda batch, processed, total: "All hospitals processed successfully",
+    BatchProcessingStatus.PARTIALLY_COMPLETED:
+        lambda batch, processed, total: f"Completed with {batch.failed_hospitals} failures",
+    BatchProcessingStatus.FAILED:
+        lambda batch, processed, total: "Processing failed",
+}
+
+
 class BatchService:
     MAX_CONCURRENT_REQUESTS = 20
-    
+    BULK_CHUNK_SIZE = 200
+
     def __init__(self):
         self.repository = batch_repository
         self.hospital_service = hospital_service
@@ -27,7 +56,8 @@ class BatchService:
     async def initiate_csv_upload(self, file: UploadFile) -> BatchUploadResponse:
         parsed_rows, _ = await self.csv_validator.validate_and_parse(file)
 
-        batch_id = str(uuid.uuid4())
+        # hex form: no dash formatting and 4 fewer bytes in every key
+        batch_id = uuid.uuid4().hex
 
         batch_data = BatchData(
             batch_id=batch_id,
@@ -35,52 +65,55 @@ class BatchService:
             processing_status=BatchProcessingStatus.PENDING
         )
 
-        self.repository.save(batch_data)
+        await self.repository.save(batch_data)
 
-        asyncio.create_task(self._process_batch_async(batch_id, parsed_rows))
+        if settings.REDIS_URL:
+            # Enqueue to a Celery worker so the batch survives API restarts
+            # and processing can be spread across machines.
+            from app.tasks import process_batch
+            process_batch.delay(batch_id, parsed_rows)
+        else:
+            # Single-process fallback for local development without a broker
+            asyncio.create_task(self._process_batch_async(batch_id, parsed_rows))
         
         return BatchUploadResponse(
             batch_id=batch_id,
             total_hospitals=len(parsed_rows),
-            message=f"CSV upload initiated. Use /[batch_id]/status to track progress.",
+            message="CSV upload initiated. Use /[batch_id]/status to track progress.",
             status=BatchProcessingStatus.PENDING
         )
     
     async def _process_batch_async(self, batch_id: str, parsed_rows: List[Dict[str, str]]):
         start_time = time.time()
 
-        batch_data = self.repository.get(batch_id)
+        batch_data = await self.repository.get(batch_id)
         batch_data.processing_status = BatchProcessingStatus.PROCESSING
         batch_data.started_at = datetime.utcnow()
-        self.repository.save(batch_data)
+        await self.repository.save(batch_data)
 
-        hospitals_records = await self._create_hospitals_parallel(
+        hospitals_table = await self._create_hospitals_parallel(
             parsed_rows, batch_id
         )
-        
 
-        processed_count = sum(
-            1 for h in hospitals_records 
-            if h.status == HospitalStatus.CREATED
-        )
-        failed_count = sum(
-            1 for h in hospitals_records 
-            if h.status == HospitalStatus.FAILED
-        )
+        # Counters were maintained incrementally while chunks completed; this
+        # single column pass just writes the authoritative final numbers.
+        status_counts = hospitals_table.status_counts()
+        processed_count = status_counts[HospitalStatus.CREATED]
+        failed_count = status_counts[HospitalStatus.FAILED]
 
-        batch_data.hospitals = hospitals_records
+        batch_data.hospitals = hospitals_table
         batch_data.processed_hospitals = processed_count
         batch_data.failed_hospitals = failed_count
-        self.repository.save(batch_data)
+        await self.repository.save(batch_data)
 
         batch_activated = False
         if processed_count > 0:
             activation_result = await self.hospital_service.activate_batch(batch_id)
             if activation_result and activation_result.activated_count > 0:
                 batch_activated = True
-                for hospital_record in hospitals_records:
-                    if hospital_record.status == HospitalStatus.CREATED:
-                        hospital_record.status = HospitalStatus.CREATED_AND_ACTIVATED
+                hospitals_table.replace_status(
+                    HospitalStatus.CREATED, HospitalStatus.CREATED_AND_ACTIVATED
+                )
         
         processing_time = time.time() - start_time
         
@@ -92,143 +125,167 @@ class BatchService:
             else BatchProcessingStatus.FAILED
         )
         batch_data.completed_at = datetime.utcnow()
-        self.repository.save(batch_data)
+        await self.repository.save(batch_data)
     
     async def _create_hospitals_parallel(
         self, 
         parsed_rows: List[Dict[str, str]], 
         batch_id: str
-    ) -> List[HospitalRecord]:
-        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
-        
-        async def create_with_semaphore(row: Dict[str, str], row_number: int):
-            async with semaphore:
-                return await self._create_hospital_from_row(row, row_number, batch_id)
-        
+    ) -> HospitalTable:
+        # Fixed pool of workers draining a queue: O(workers) coroutines in
+        # flight instead of one task (and future) per pending chunk.
+        queue: asyncio.Queue = asyncio.Queue()
+        chunk_offsets = range(0, len(parsed_rows), self.BULK_CHUNK_SIZE)
+        chunk_results: List[List[HospitalRecord]] = [[] for _ in chunk_offsets]
+
+        for index, offset in enumerate(chunk_offsets):
+            queue.put_nowait((index, offset))
+
+        async def worker():
+            while True:
+                try:
+                    index, offset = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                chunk = parsed_rows[offset:offset + self.BULK_CHUNK_SIZE]
+                chunk_results[index] = await self._create_hospital_chunk(
+                    chunk, offset + 1, batch_id
+                )
 
-        tasks = [
-            create_with_semaphore(row, idx)
-            for idx, row in enumerate(parsed_rows, start=1)
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.MAX_CONCURRENT_REQUESTS, len(chunk_results)))
         ]
+        await asyncio.gather(*workers)
 
-        hospitals_records = await asyncio.gather(*tasks)
-        
-        return list(hospitals_records)
-    
-    async def _create_hospital_from_row(
-        self, 
-        row: Dict[str, str], 
-        row_number: int, 
+        table = HospitalTable()
+        for chunk in chunk_results:
+            table.extend(chunk)
+        return table
+
+    async def _create_hospital_chunk(
+        self,
+        chunk: List[Dict[str, str]],
+        start_row: int,
         batch_id: str
-    ) -> HospitalRecord:
-        try:
-            hospital_create = HospitalCreate(
-                name=row['name'].strip(),
-                address=row['address'].strip(),
+    ) -> List[HospitalRecord]:
+        """Create a chunk of hospitals, preferring one bulk request per chunk"""
+        hospital_creates = [
+            HospitalCreate(
+                name=row['name'],
+                address=row['address'],
                 phone=row.get('phone'),
                 creation_batch_id=batch_id
             )
-            
-            created_hospital = await self.hospital_service.create_hospital(
-                hospital_create
-            )
-            
+            for row in chunk
+        ]
+
+        created_hospitals = await self.hospital_service.create_batch(
+            hospital_creates, batch_id
+        )
+
+        if created_hospitals is not None and len(created_hospitals) == len(chunk):
+            await self.repository.increment_processed(batch_id, len(created_hospitals))
+            return [
+                HospitalRecord.model_construct(
+                    row=start_row + offset,
+                    hospital_id=hospital.id,
+                    name=hospital.name,
+                    address=hospital.address,
+                    phone=hospital.phone,
+                    status=HospitalStatus.CREATED
+                )
+                for offset, hospital in enumerate(created_hospitals)
+            ]
+
+        # Bulk endpoint unavailable — fall back to per-row creates pipelined
+        # concurrently on the shared client; the connection pool bounds total
+        # fan-out across chunk workers.
+        created_results = await self.hospital_service.create_hospitals_concurrent(
+            hospital_creates
+        )
+
+        records = []
+        succeeded = 0
+        failed = 0
+        for offset, (hospital_create, created_hospital) in enumerate(
+            zip(hospital_creates, created_results)
+        ):
             if created_hospital:
-                batch_data = self.repository.get(batch_id)
-                if batch_data:
-                    hospital_record = HospitalRecord(
-                        row=row_number,
-                        hospital_id=created_hospital.id,
-                        name=created_hospital.name,
-                        address=created_hospital.address,
-                        phone=created_hospital.phone,
-                        status=HospitalStatus.CREATED
-                    )
-
-                    batch_data.processed_hospitals = len([
-                        h for h in batch_data.hospitals 
-                        if h.status in [HospitalStatus.CREATED, HospitalStatus.CREATED_AND_ACTIVATED]
-                    ]) + 1
-                    self.repository.save(batch_data)
-                    
-                    return hospital_record
-                else:
-                    return HospitalRecord(
-                        row=row_number,
-                        hospital_id=created_hospital.id,
-                        name=created_hospital.name,
-                        address=created_hospital.address,
-                        phone=created_hospital.phone,
-                        status=HospitalStatus.CREATED
-                    )
+                succeeded += 1
+                records.append(HospitalRecord.model_construct(
+                    row=start_row + offset,
+                    hospital_id=created_hospital.id,
+                    name=created_hospital.name,
+                    address=created_hospital.address,
+                    phone=created_hospital.phone,
+                    status=HospitalStatus.CREATED
+                ))
             else:
-                # Update failed count
-                batch_data = self.repository.get(batch_id)
-                if batch_data:
-                    batch_data.failed_hospitals += 1
-                    self.repository.save(batch_data)
-                
-                return HospitalRecord(
-                    row=row_number,
-                    name=row['name'].strip(),
-                    address=row['address'].strip(),
-                    phone=row.get('phone'),
+                failed += 1
+                records.append(HospitalRecord.model_construct(
+                    row=start_row + offset,
+                    name=hospital_create.name,
+                    address=hospital_create.address,
+                    phone=hospital_create.phone,
                     status=HospitalStatus.FAILED,
                     error_message="Failed to create hospital via external API"
-                )
-        except Exception as e:
-            # Update failed count
-            batch_data = self.repository.get(batch_id)
-            if batch_data:
-                batch_data.failed_hospitals += 1
-                self.repository.save(batch_data)
-            
-            return HospitalRecord(
-                row=row_number,
-                name=row.get('name', '').strip(),
-                address=row.get('address', '').strip(),
-                phone=row.get('phone'),
-                status=HospitalStatus.FAILED,
-                error_message=str(e)
-            )
+                ))
+
+        if succeeded:
+            await self.repository.increment_processed(batch_id, succeeded)
+        if failed:
+            await self.repository.increment_failed(batch_id, failed)
+        return records
     
-    async def get_batch_status(self, batch_id: str) -> BatchStatusResponse:
-        batch_data = self.repository.get(batch_id)
+    async def get_batch_status(
+        self,
+        batch_id: str,
+        limit: int = 100,
+        offset: int = 0
+    ) -> BatchStatusResponse:
+        batch_data = await self.repository.get(batch_id)
         if not batch_data:
             raise BatchNotFoundException(batch_id)
 
-        if batch_data.processing_status in [
-            BatchProcessingStatus.COMPLETED, 
-            BatchProcessingStatus.PARTIALLY_COMPLETED
-        ]:
+        if batch_data.processing_status in _FINISHED_BATCH_STATES:
             external_hospitals = await self.hospital_service.get_hospitals_by_batch(batch_id)
             external_hospitals_map = {h.id: h for h in external_hospitals}
-            
+
+            # Collect (index, status) deltas and persist only those, instead
+            # of re-saving (and re-serializing) the entire batch per poll.
+            hospitals_table = batch_data.hospitals
+            status_changes = []
             deleted_count = 0
-            for hospital_record in batch_data.hospitals:
-                if hospital_record.hospital_id:
-                    external_hospital = external_hospitals_map.get(hospital_record.hospital_id)
-                    
-                    if not external_hospital:
-                        if hospital_record.status != HospitalStatus.DELETED:
-                            hospital_record.status = HospitalStatus.DELETED
-                            deleted_count += 1
-                    else:
-                        if external_hospital.active:
-                            if hospital_record.status != HospitalStatus.DELETED:
-                                hospital_record.status = HospitalStatus.CREATED_AND_ACTIVATED
-                        else:
-                            if hospital_record.status not in [HospitalStatus.DELETED, HospitalStatus.FAILED]:
-                                hospital_record.status = HospitalStatus.CREATED
-            
-            self.repository.save(batch_data)
+            for index, hospital_id in enumerate(hospitals_table.hospital_ids):
+                if not hospital_id:
+                    continue
+
+                current_status = hospitals_table.status_at(index)
+                external_hospital = external_hospitals_map.get(hospital_id)
+
+                if not external_hospital:
+                    deleted_count += 1
+                    new_status = HospitalStatus.DELETED
+                elif external_hospital.active:
+                    if current_status == HospitalStatus.DELETED:
+                        continue
+                    new_status = HospitalStatus.CREATED_AND_ACTIVATED
+                else:
+                    if current_status in _TERMINAL_RECORD_STATES:
+                        continue
+                    new_status = HospitalStatus.CREATED
+
+                if current_status != new_status:
+                    hospitals_table.update_status(index, new_status)
+                    status_changes.append((index, new_status))
+
+            if status_changes:
+                await self.repository.bulk_update_statuses(batch_id, status_changes)
         else:
-            deleted_count = len([
-                h for h in batch_data.hospitals 
-                if h.status == HospitalStatus.DELETED
-            ])
-        
-        return BatchStatusResponse(
+            deleted_count = batch_data.hospitals.count_by_status(HospitalStatus.DELETED)
+
+        return BatchStatusResponse.model_construct(
             batch_id=batch_id,
             total_hospitals=batch_data.total_hospitals,
             processed_hospitals=batch_data.processed_hospitals,
@@ -236,11 +293,12 @@ class BatchService:
             deleted_hospitals=deleted_count,
             batch_activated=batch_data.batch_activated,
             processing_status=batch_data.processing_status,
-            hospitals=batch_data.hospitals
+            # Materialize only the requested window; counters cover the batch
+            hospitals=batch_data.hospitals.to_records(offset=offset, limit=limit)
         )
     
     async def get_batch_progress(self, batch_id: str) -> BatchProgressResponse:
-        batch_data = self.repository.get(batch_id)
+        batch_data = await self.repository.get(batch_id)
         if not batch_data:
             raise BatchNotFoundException(batch_id)
         
@@ -248,20 +306,13 @@ class BatchService:
         processed = batch_data.processed_hospitals + batch_data.failed_hospitals
         progress_percentage = (processed / total * 100) if total > 0 else 0
         
-        if batch_data.processing_status == BatchProcessingStatus.PENDING:
-            current_message = "Batch processing queued"
-        elif batch_data.processing_status == BatchProcessingStatus.PROCESSING:
-            current_message = f"Processing hospital {processed}/{total}"
-        elif batch_data.processing_status == BatchProcessingStatus.COMPLETED:
-            current_message = "All hospitals processed successfully"
-        elif batch_data.processing_status == BatchProcessingStatus.PARTIALLY_COMPLETED:
-            current_message = f"Completed with {batch_data.failed_hospitals} failures"
-        elif batch_data.processing_status == BatchProcessingStatus.FAILED:
-            current_message = "Processing failed"
-        else:
-            current_message = "Unknown status"
+        message_builder = _PROGRESS_MESSAGES.get(batch_data.processing_status)
+        current_message = (
+            message_builder(batch_data, processed, total)
+            if message_builder else "Unknown status"
+        )
         
-        return BatchProgressResponse(
+        return BatchProgressResponse.model_construct(
             batch_id=batch_id,
             progress_percentage=round(progress_percentage, 2),
             processing_status=batch_data.processing_status,
@@ -1,120 +1,232 @@
+import asyncio
 import httpx
-from typing import List, Optional
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
 from app.core.config import settings
+from pydantic import TypeAdapter
 from app.models.schemas import (
-    Hospital, HospitalCreate, HospitalUpdate, 
+    Hospital, HospitalCreate, HospitalUpdate,
     ActivateResponse, DeleteResponse
 )
 
+# Precompiled serializers: to_json() emits request bytes straight from the
+# Rust core instead of model_dump() building a dict that httpx re-encodes.
+_CREATE_SERIALIZER = HospitalCreate.__pydantic_serializer__
+_UPDATE_SERIALIZER = HospitalUpdate.__pydantic_serializer__
+_CREATE_LIST_ADAPTER = TypeAdapter(List[HospitalCreate])
+# Validating response.content directly keeps JSON parsing and field
+# validation in the Rust core, skipping the response.json() dict round trip.
+_HOSPITAL_LIST_ADAPTER = TypeAdapter(List[Hospital])
+
+logger = logging.getLogger(__name__)
+
+# Only transport and HTTP-status failures are treated as "hospital call
+# failed"; cancellation and validation bugs must propagate.
+_REQUEST_ERRORS = (httpx.HTTPStatusError, httpx.RequestError)
+
 
 class HospitalService:
+    # Batch listings are polled by every dashboard viewer; a few seconds of
+    # staleness is acceptable and flattens external API traffic.
+    BATCH_CACHE_TTL = 3.0
+    BATCH_CACHE_MAX_SIZE = 1024
+    # Single-hospital lookups repeat heavily while a batch is polled; a short
+    # TTL keeps the window of staleness comparable to the batch cache.
+    GET_CACHE_TTL = 5.0
+    GET_CACHE_MAX_SIZE = 1024
+
     def __init__(self):
         self.base_url = settings.EXTERNAL_API_BASE_URL
-        self.timeout = 30.0
-    
+        self.timeout = httpx.Timeout(30.0, connect=5.0)
+        self._batch_cache: Dict[str, Tuple[float, List[Hospital]]] = {}
+        self._get_cache: Dict[int, Tuple[float, Hospital]] = {}
+        # None until the first probe of the upstream batch-create endpoint
+        self._batch_create_supported: Optional[bool] = None
+        # One long-lived client: connections are pooled and kept alive, so
+        # fan-out to the external API reuses warm TCP+TLS sessions instead of
+        # paying a handshake per call. With HTTP/2 concurrent requests
+        # multiplex over a handful of connections, so the pool can stay small
+        # while still covering an HTTP/1.1-only upstream at full concurrency.
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            http2=True,
+            headers={
+                "accept": "application/json",
+                "Content-Type": "application/json"
+            },
+            limits=httpx.Limits(
+                max_keepalive_connections=16,
+                max_connections=32,
+                keepalive_expiry=60
+            )
+        )
+
+    async def aclose(self) -> None:
+        """Close the pooled client (wired to app shutdown)"""
+        await self._client.aclose()
+
     async def create_hospital(self, hospital_data: HospitalCreate) -> Optional[Hospital]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/hospitals/",
-                    json=hospital_data.model_dump(exclude_none=False),
-                    headers={
-                        "accept": "application/json",
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                return Hospital(**response.json())
-            except Exception as e:
+        try:
+            response = await self._client.post(
+                "/hospitals/",
+                content=_CREATE_SERIALIZER.to_json(hospital_data, exclude_none=False)
+            )
+            response.raise_for_status()
+            return Hospital.model_validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("create_hospital failed: %s", exc)
+            return None
+
+    async def create_batch(
+        self,
+        hospitals: List[HospitalCreate],
+        batch_id: str
+    ) -> Optional[List[Hospital]]:
+        """Create multiple hospitals with one POST to the batch endpoint.
+
+        Returns the created hospitals in input order, or None when the batch
+        endpoint is unavailable so callers can fall back to per-row creates.
+        Support is feature-detected once (404/405) and remembered, so an
+        upstream without the endpoint costs a single probe per process.
+        """
+        if self._batch_create_supported is False:
+            return None
+
+        try:
+            response = await self._client.post(
+                f"/hospitals/batch/{batch_id}",
+                content=_CREATE_LIST_ADAPTER.dump_json(hospitals, exclude_none=False)
+            )
+            if response.status_code in (404, 405):
+                self._batch_create_supported = False
                 return None
-    
+            response.raise_for_status()
+            self._batch_create_supported = True
+            return _HOSPITAL_LIST_ADAPTER.validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            # Transient failure — leave the support flag unset so we re-probe
+            logger.debug("create_batch failed for %s: %s", batch_id, exc)
+            return None
+
+    async def create_hospitals_concurrent(
+        self,
+        hospitals: List[HospitalCreate],
+        concurrency: int = 32
+    ) -> List[Optional[Hospital]]:
+        """Create hospitals with per-row requests pipelined concurrently.
+
+        Results align with the input order; failed creates yield None. The
+        semaphore caps in-flight requests, and the shared client's pool
+        bounds total connections across concurrent callers.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create_one(hospital_data: HospitalCreate) -> Optional[Hospital]:
+            async with semaphore:
+                return await self.create_hospital(hospital_data)
+
+        return await asyncio.gather(*[create_one(h) for h in hospitals])
+
     async def get_hospital(self, hospital_id: int) -> Optional[Hospital]:
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/hospitals/{hospital_id}",
-                    headers={"accept": "application/json"}
-                )
-                response.raise_for_status()
-                return Hospital(**response.json())
-            except Exception:
-                return None
-    
+        cached = self._get_cache.get(hospital_id)
+        if cached and time.monotonic() - cached[0] < self.GET_CACHE_TTL:
+            return cached[1]
+
+        try:
+            response = await self._client.get(f"/hospitals/{hospital_id}")
+            response.raise_for_status()
+            hospital = Hospital.model_validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("get_hospital(%s) failed: %s", hospital_id, exc)
+            return None
+
+        if len(self._get_cache) >= self.GET_CACHE_MAX_SIZE:
+            self._get_cache.pop(next(iter(self._get_cache)))
+        self._get_cache[hospital_id] = (time.monotonic(), hospital)
+        return hospital
+
     async def get_hospitals_by_batch(self, batch_id: str) -> List[Hospital]:
-        """Get all hospitals in a batch"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/hospitals/batch/{batch_id}",
-                    headers={"accept": "application/json"}
-                )
-                response.raise_for_status()
-                return [Hospital(**h) for h in response.json()]
-            except Exception:
-                return []
-    
+        """Get all hospitals in a batch (cached for a few seconds)"""
+        cached = self._batch_cache.get(batch_id)
+        if cached and time.monotonic() - cached[0] < self.BATCH_CACHE_TTL:
+            return cached[1]
+
+        try:
+            response = await self._client.get(f"/hospitals/batch/{batch_id}")
+            response.raise_for_status()
+            hospitals = _HOSPITAL_LIST_ADAPTER.validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("get_hospitals_by_batch(%s) failed: %s", batch_id, exc)
+            return []
+
+        if len(self._batch_cache) >= self.BATCH_CACHE_MAX_SIZE:
+            self._batch_cache.pop(next(iter(self._batch_cache)))
+        self._batch_cache[batch_id] = (time.monotonic(), hospitals)
+        return hospitals
+
     async def activate_batch(self, batch_id: str) -> Optional[ActivateResponse]:
         """Activate all hospitals in a batch"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.patch(
-                    f"{self.base_url}/hospitals/batch/{batch_id}/activate",
-                    json={},
-                    headers={
-                        "accept": "application/json",
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                return ActivateResponse(**response.json())
-            except Exception:
-                return None
-    
+        try:
+            response = await self._client.patch(
+                f"/hospitals/batch/{batch_id}/activate",
+                # Constant empty body; no reason to json-encode {} per call
+                content=b"{}"
+            )
+            response.raise_for_status()
+            # Activation flips every hospital in the batch, so both caches
+            # may hold stale entries.
+            self._batch_cache.pop(batch_id, None)
+            self._get_cache.clear()
+            return ActivateResponse.model_validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("activate_batch(%s) failed: %s", batch_id, exc)
+            return None
+
     async def update_hospital(
-        self, 
-        hospital_id: int, 
+        self,
+        hospital_id: int,
         hospital_data: HospitalUpdate
     ) -> Optional[Hospital]:
         """Update hospital"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.put(
-                    f"{self.base_url}/hospitals/{hospital_id}",
-                    json=hospital_data.model_dump(exclude_none=True),
-                    headers={
-                        "accept": "application/json",
-                        "Content-Type": "application/json"
-                    }
-                )
-                response.raise_for_status()
-                return Hospital(**response.json())
-            except Exception:
-                return None
-    
+        try:
+            response = await self._client.put(
+                f"/hospitals/{hospital_id}",
+                content=_UPDATE_SERIALIZER.to_json(hospital_data, exclude_none=True)
+            )
+            response.raise_for_status()
+            self._get_cache.pop(hospital_id, None)
+            return Hospital.model_validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("update_hospital(%s) failed: %s", hospital_id, exc)
+            return None
+
     async def delete_hospital(self, hospital_id: int) -> bool:
         """Delete hospital by ID"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.delete(
-                    f"{self.base_url}/hospitals/{hospital_id}",
-                    headers={"accept": "application/json"}
-                )
-                return response.status_code == 204
-            except Exception:
-                return False
-    
+        try:
+            response = await self._client.delete(f"/hospitals/{hospital_id}")
+            self._get_cache.pop(hospital_id, None)
+            # A successful delete is a bodyless 204 — only the status code
+            # matters, so the body is deliberately never parsed. The explicit
+            # close documents that and returns the connection to the pool.
+            await response.aclose()
+            return response.status_code == 204
+        except _REQUEST_ERRORS as exc:
+            logger.debug("delete_hospital(%s) failed: %s", hospital_id, exc)
+            return False
+
     async def delete_batch(self, batch_id: str) -> Optional[DeleteResponse]:
         """Delete all hospitals in a batch"""
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.delete(
-                    f"{self.base_url}/hospitals/batch/{batch_id}",
-                    headers={"accept": "application/json"}
-                )
-                response.raise_for_status()
-                return DeleteResponse(**response.json())
-            except Exception:
-                return None
+        try:
+            response = await self._client.delete(f"/hospitals/batch/{batch_id}")
+            response.raise_for_status()
+            self._batch_cache.pop(batch_id, None)
+            self._get_cache.clear()
+            return DeleteResponse.model_validate_json(response.content)
+        except _REQUEST_ERRORS as exc:
+            logger.debug("delete_batch(%s) failed: %s", batch_id, exc)
+            return None
 
 
 # Singleton instance
@@ -0,0 +1,54 @@
+import asyncio
+from celery import Celery
+from app.core.config import settings
+
+# Celery app for background batch processing.
+# Workers are started with: celery -A app.tasks worker -Q batch.upload,batch.activate
+celery = Celery(
+    "hospital",
+    broker=settings.REDIS_URL,
+    backend=settings.REDIS_URL,
+)
+
+celery.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    result_serializer="json",
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    # Route heavy upload processing and lightweight activation to dedicated
+    # queues so they can be scaled independently.
+    task_routes={
+        "app.tasks.process_batch": {"queue": "batch.upload"},
+        "app.tasks.activate_batch": {"queue": "batch.activate"},
+    },
+)
+
+
+# One long-lived event loop per worker process. The service singletons hold
+# pooled httpx and redis connections that bind to the loop they first run on;
+# a per-task asyncio.run() would close that loop and leave every later task
+# failing with "Event loop is closed" on the reused connections.
+_loop = None
+
+
+def _run(coro):
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_loop)
+    return _loop.run_until_complete(coro)
+
+
+@celery.task(name="app.tasks.process_batch")
+def process_batch(batch_id: str, parsed_rows: list):
+    """Process a validated CSV batch in a worker process"""
+    from app.services.batch_service import batch_service
+    _run(batch_service._process_batch_async(batch_id, parsed_rows))
+
+
+@celery.task(name="app.tasks.activate_batch")
+def activate_batch(batch_id: str):
+    """Activate all created hospitals in a batch"""
+    from app.services.hospital_service import hospital_service
+    _run(hospital_service.activate_batch(batch_id))